@@ -0,0 +1,326 @@
+"""PieDB benchmark suite.
+
+Times every Database operation on synthetic collections of different sizes, with
+and without a schema, and saves throughput, latency percentiles, peak RSS and
+bytes written as JSON so runs can be compared. Each size/schema case runs in its
+own process so peak RSS is not carried over from earlier cases.
+
+    python benchmarks/bench.py run --sizes 1000 100000 1000000 --out results.json
+    python benchmarks/bench.py compare baseline.json results.json --threshold 0.10
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+from datetime import timedelta
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from piedb import Database
+
+
+COLLECTION = "bench"
+CITIES = ["city-%d" % i for i in range(50)]
+SCHEMA = {
+    "name": "str",
+    "age": "int",
+    "balance": "float",
+    "is_active": "bool",
+    "city": "str",
+    "tags": "list",
+    "created_at": "datetime",
+}
+
+
+def make_document(i: int, rng: random.Random) -> dict:
+    """Build one synthetic document."""
+
+    return {
+        "name": "user-%d" % i,
+        "age": rng.randint(18, 90),
+        "balance": round(rng.uniform(0, 10000), 2),
+        "is_active": rng.random() < 0.5,
+        "city": rng.choice(CITIES),
+        "tags": rng.sample(["a", "b", "c", "d", "e"], 2),
+        "created_at": (datetime(2025, 1, 1) + timedelta(seconds=i)).isoformat(),
+    }
+
+
+def generate_db(path: str, size: int, with_schema: bool, seed: int = 42) -> None:
+    """Write a database file with `size` documents directly, without going through add()."""
+
+    rng = random.Random(seed)
+    documents = []
+    for i in range(size):
+        doc = make_document(i, rng)
+        doc["_id"] = "bench%010d" % i
+        documents.append(doc)
+
+    data = {
+        "_meta": {
+            "_version": "2.0.0",
+            "_path": os.path.dirname(path),
+            "_count": {COLLECTION: size},
+            "_schema": {COLLECTION: SCHEMA if with_schema else {}},
+            "_dead": {COLLECTION: 0},
+        },
+        COLLECTION: documents,
+    }
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process in bytes, or None if unavailable."""
+
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def bytes_written() -> int:
+    """Bytes passed to write() by this process so far, or None if unavailable."""
+
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of a sorted list."""
+
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, int(round(pct / 100.0 * len(values))) - 1))
+    return values[index]
+
+
+def measure(func, iterations: int, max_seconds: float, docs_per_call: int = 1) -> dict:
+    """Call func(i) up to `iterations` times (at least 3, within max_seconds) and summarize."""
+
+    latencies = []
+    written_before = bytes_written()
+    started = time.perf_counter()
+
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        func(i)
+        latencies.append(time.perf_counter() - t0)
+        if i >= 2 and time.perf_counter() - started > max_seconds:
+            break
+
+    total = sum(latencies)
+    written_after = bytes_written()
+    latencies.sort()
+
+    return {
+        "calls": len(latencies),
+        "total_s": total,
+        "ops_per_s": len(latencies) / total if total else None,
+        "docs_per_s": len(latencies) * docs_per_call / total if total else None,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p90_ms": percentile(latencies, 90) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "bytes_written": (written_after - written_before) if written_before is not None else None,
+        "peak_rss": peak_rss(),
+    }
+
+
+def bench_case(workdir: str, size: int, with_schema: bool, args) -> dict:
+    """Run every operation against one generated database."""
+
+    name = os.path.join(workdir, "bench_%d_%s" % (size, "schema" if with_schema else "plain"))
+    generate_db(name + ".json", size, with_schema)
+
+    db = Database(name)
+    rng = random.Random(7)
+    results = {}
+
+    rss_before = peak_rss()
+    t0 = time.perf_counter()
+    db.get_count(COLLECTION)
+    results["load"] = {"calls": 1, "total_s": time.perf_counter() - t0, "peak_rss": peak_rss(), "rss_before": rss_before}
+
+    def run(op, func, iterations=None, docs_per_call=1):
+        results[op] = measure(func, iterations or args.iterations, args.max_seconds, docs_per_call)
+        print("  %-16s %8d calls  p50 %10.3f ms  p99 %10.3f ms" % (op, results[op]["calls"], results[op]["p50_ms"], results[op]["p99_ms"]), flush=True)
+
+    run("add", lambda i: db.add(COLLECTION, make_document(size + i, rng)))
+    run("add_many", lambda i: db.add_many(COLLECTION, [make_document(size + i * args.batch + j, rng) for j in range(args.batch)]), docs_per_call=args.batch)
+
+    range_start = datetime(2025, 1, 1) + timedelta(seconds=size // 2)
+    range_end = range_start + timedelta(seconds=max(1, size // 100))
+    if not with_schema:
+        range_start, range_end = range_start.isoformat(), range_end.isoformat()
+
+    run("find_eq", lambda i: db.find(COLLECTION, {"city": {"$eq": rng.choice(CITIES)}}))
+    run("find_range", lambda i: db.find(COLLECTION, {"created_at": {"$gt": range_start, "$lt": range_end}}))
+    run("find_or", lambda i: db.find(COLLECTION, {"$or": [{"age": {"$lt": 20}}, {"balance": {"$gt": 9900.0}}, {"city": {"$eq": "city-1"}}]}))
+    run("find_sort_limit", lambda i: db.find(COLLECTION, {"is_active": True}, limit=10, sort="balance", order="desc"))
+    run("update", lambda i: db.update(COLLECTION, {"$inc": {"age": 1}}, {"city": {"$eq": rng.choice(CITIES)}}, limit=1, return_docs=False))
+    run("delete", lambda i: db.delete(COLLECTION, {"city": {"$eq": rng.choice(CITIES)}}, limit=1))
+
+    backups = []
+    run("backup_db", lambda i: backups.append(db.backup_db(os.path.join(workdir, "backup_%d" % i))), iterations=3)
+
+    if size <= args.restore_max:
+        restored = db.get_count(COLLECTION)
+
+        def restore(i):
+            target = Database(os.path.join(workdir, "restore_%d_%s_%d" % (size, "schema" if with_schema else "plain", i)))
+            target.restore_db(backups[0])
+        run("restore_db", restore, iterations=1, docs_per_call=restored)
+    else:
+        results["restore_db"] = {"skipped": "size above --restore-max"}
+
+    db.close()
+    return results
+
+
+def git_revision() -> str:
+    """Current git commit of the checkout, if any."""
+
+    try:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=root, stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def cmd_case(args) -> int:
+    """Run one size/schema case in this process and write its results as JSON."""
+
+    results = bench_case(args.workdir, args.size, args.schema, args)
+    with open(args.out, "w") as f:
+        json.dump(results, f)
+    return 0
+
+
+def run_case(workdir: str, size: int, with_schema: bool, args) -> dict:
+    """Run one case in a fresh interpreter so its peak RSS is its own."""
+
+    out = os.path.join(workdir, "case_%d_%s.json" % (size, "schema" if with_schema else "plain"))
+    command = [sys.executable, os.path.abspath(__file__), "case", "--size", str(size), "--workdir", workdir, "--out", out,
+               "--iterations", str(args.iterations), "--batch", str(args.batch), "--max-seconds", str(args.max_seconds),
+               "--restore-max", str(args.restore_max)]
+    if with_schema:
+        command.append("--schema")
+    subprocess.run(command, check=True, cwd=workdir)
+    with open(out) as f:
+        return json.load(f)
+
+
+def cmd_run(args) -> int:
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "git": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"iterations": args.iterations, "batch": args.batch, "max_seconds": args.max_seconds},
+        "results": {},
+    }
+
+    workdir = tempfile.mkdtemp(prefix="piedb-bench-")
+    cwd = os.getcwd()
+    try:
+        os.chdir(workdir)
+        for size in args.sizes:
+            for with_schema in (False, True):
+                key = "%d/%s" % (size, "schema" if with_schema else "plain")
+                print("%s:" % key, flush=True)
+                report["results"][key] = run_case(workdir, size, with_schema, args)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=4)
+    print("Results saved to '%s'." % args.out)
+    return 0
+
+
+def cmd_compare(args) -> int:
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    with open(args.current) as f:
+        current = json.load(f)["results"]
+
+    regressions = 0
+    for case in sorted(set(baseline) & set(current)):
+        for op in sorted(set(baseline[case]) & set(current[case])):
+            old, new = baseline[case][op].get("p50_ms"), current[case][op].get("p50_ms")
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            flag = ""
+            if change > args.threshold:
+                flag = "  REGRESSION"
+                regressions += 1
+            elif change < -args.threshold:
+                flag = "  improved"
+            print("%-16s %-16s %10.3f -> %10.3f ms  %+7.1f%%%s" % (case, op, old, new, change * 100, flag))
+
+    print("%d regression(s) above %.0f%%." % (regressions, args.threshold * 100))
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="PieDB benchmark suite", prog="bench")
+    subparsers = parser.add_subparsers(dest="command")
+
+    parser_run = subparsers.add_parser("run", help="Run the benchmarks")
+    parser_run.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000], help="Collection sizes to benchmark")
+    parser_run.add_argument("--iterations", type=int, default=50, help="Calls per operation")
+    parser_run.add_argument("--batch", type=int, default=100, help="Documents per add_many call")
+    parser_run.add_argument("--max-seconds", type=float, default=10.0, help="Time budget per operation (at least 3 calls are made)")
+    parser_run.add_argument("--restore-max", type=int, default=1000, help="Largest size for which restore_db is benchmarked")
+    parser_run.add_argument("--out", type=str, default="bench-%s.json" % datetime.now().strftime("%Y%m%d_%H%M%S"), help="Output JSON file")
+
+    parser_case = subparsers.add_parser("case", help=argparse.SUPPRESS)
+    parser_case.add_argument("--size", type=int, required=True)
+    parser_case.add_argument("--schema", action="store_true")
+    parser_case.add_argument("--workdir", type=str, required=True)
+    parser_case.add_argument("--out", type=str, required=True)
+    parser_case.add_argument("--iterations", type=int, default=50)
+    parser_case.add_argument("--batch", type=int, default=100)
+    parser_case.add_argument("--max-seconds", type=float, default=10.0)
+    parser_case.add_argument("--restore-max", type=int, default=1000)
+
+    parser_compare = subparsers.add_parser("compare", help="Compare two result files and flag regressions")
+    parser_compare.add_argument("baseline", type=str, help="Baseline results JSON")
+    parser_compare.add_argument("current", type=str, help="Current results JSON")
+    parser_compare.add_argument("--threshold", type=float, default=0.10, help="Relative p50 slowdown flagged as a regression")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        return cmd_run(args)
+    if args.command == "case":
+        return cmd_case(args)
+    if args.command == "compare":
+        return cmd_compare(args)
+    parser.print_help()
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
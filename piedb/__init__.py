@@ -1 +1,2 @@
-from .db import Database
\ No newline at end of file
+from .db import Database
+from .client import RemoteDatabase
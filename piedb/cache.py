@@ -0,0 +1,108 @@
+import json
+from threading import Lock
+from collections import OrderedDict
+
+from .util import Utility
+
+
+class QueryCache:
+    """LRU cache of find() results, invalidated by per-collection write versions and capped by a byte budget.
+
+    Results are deep-copied on put and on get, so neither the caller that filled an entry nor later hits can change it."""
+
+    SIZE_CHUNK = 256
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        self._entries = OrderedDict()
+        self._versions = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(collection: str, query: dict, sort: str, order: str, skip: int, limit: int) -> tuple:
+        """Canonical cache key: the same query with keys in any order maps to the same entry."""
+
+        return (collection, json.dumps(query or {}, sort_keys=True, default=repr), sort, order, skip, limit)
+
+    def get(self, key: tuple) -> list:
+        """Return cached results for a key, or None if missing or written to since it was cached."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == self._versions.get(key[0], 0):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                results = entry[1]
+            else:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+        return [Utility.copy_document(doc) for doc in results]
+
+    def version(self, collection: str) -> int:
+        """Current write version of a collection, to pass to put() for results computed from a snapshot."""
+
+        with self._lock:
+            return self._versions.get(collection, 0)
+
+    def _size(self, results: list) -> int:
+        """Approximate serialized size of results, or None as soon as it exceeds the budget."""
+
+        size = 0
+        for start in range(0, len(results), self.SIZE_CHUNK):
+            size += len(json.dumps(results[start:start + self.SIZE_CHUNK], default=repr))
+            if size > self.max_bytes:
+                return None
+        return size
+
+    def put(self, key: tuple, results: list, version: int =None) -> None:
+        size = self._size(results)
+        if size is None:
+            return
+        results = [Utility.copy_document(doc) for doc in results]
+
+        with self._lock:
+            current = self._versions.get(key[0], 0)
+            if version is not None and version != current:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (current, results, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: tuple) -> None:
+        self.bytes -= self._entries.pop(key)[2]
+
+    def invalidate(self, collection: str) -> None:
+        """Bump a collection's write version so its cached results are no longer served."""
+
+        with self._lock:
+            self._versions[collection] = self._versions.get(collection, 0) + 1
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. after the database file was changed externally."""
+
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            for collection in self._versions:
+                self._versions[collection] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+            }
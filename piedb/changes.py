@@ -0,0 +1,86 @@
+import time
+import itertools
+from threading import Condition
+from collections import deque
+
+from .util import Utility
+from .error import ChangeFeedError
+
+
+class ChangeFeed:
+    """Bounded in-memory ring buffer of insert/update/delete events with sequence numbers.
+
+    Buffered documents are deep copies, and every reader gets its own copy, so events never share values with the database."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._events = deque(maxlen=capacity)
+        self._condition = Condition()
+        self._seq = 0
+        self._closed = False
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the latest event."""
+
+        return self._seq
+
+    def publish(self, op: str, collection: str, documents: list) -> None:
+        """Append one event per document. Only the newest `capacity` documents are copied into the buffer."""
+
+        if not documents:
+            return
+
+        with self._condition:
+            kept = documents[-self.capacity:]
+            self._seq += len(documents) - len(kept)
+            for doc in kept:
+                self._seq += 1
+                self._events.append({"seq": self._seq, "op": op, "collection": collection, "_id": doc.get("_id"), "document": Utility.copy_document(doc)})
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """Wake up and end all watchers."""
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _after(self, seq: int) -> list:
+        """Events with a sequence number greater than seq. Must be called with the condition held."""
+
+        if seq >= self._seq:
+            return []
+        first = self._seq - len(self._events) + 1
+        if seq + 1 < first:
+            raise ChangeFeedError(seq, first)
+        return list(itertools.islice(self._events, seq + 1 - first, None))
+
+    def changes(self, since: int, match) -> list:
+        """Return the buffered events after `since` that pass `match`, without waiting."""
+
+        with self._condition:
+            events = self._after(since)
+        return [dict(event, document=Utility.copy_document(event["document"])) for event in events if match(event)]
+
+    def watch(self, since: int, match, timeout: float =None):
+        """Yield events after `since` as they are published. Stops after `timeout` seconds without events, or on close."""
+
+        last = self._seq if since is None else since
+
+        while True:
+            with self._condition:
+                events = self._after(last)
+                if not events:
+                    if self._closed:
+                        return
+                    started = time.monotonic()
+                    self._condition.wait(timeout)
+                    events = self._after(last)
+                    if not events and (self._closed or (timeout is not None and time.monotonic() - started >= timeout)):
+                        return
+
+            for event in events:
+                last = event["seq"]
+                if match(event):
+                    yield dict(event, document=Utility.copy_document(event["document"]))
@@ -1,13 +1,25 @@
 import os
+import sys
+import csv
 import json
+import time
 import shlex
 import argparse
+import itertools
 from datetime import datetime
 from beautifultable import BeautifulTable
 
 from .db import Database
+from .server import serve
+from .util import CustomJSONEncoder
+
+
+# CSV column holding, as JSON, the keys that have no column of their own
+CSV_EXTRA = "_extra"
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the parser for interactive and script commands."""
 
-def main():
     
     # Initialize the argument parser
     parser = argparse.ArgumentParser(description="PieDB CLI - A simple JSON database CLI", prog="PieDB CLI")
@@ -83,6 +95,8 @@ def main():
     parser_find.add_argument('--skip', type=int, default=0, help='Number of documents to skip')
     parser_find.add_argument('--sort', type=str, default=None, help='Field for sorting the results')
     parser_find.add_argument('--order', type=str, default="asc", help='Sort order for the results')
+    parser_find.add_argument('--page-size', type=int, default=20, help='Number of documents printed per page')
+    parser_find.add_argument('--format', type=str, choices=['table', 'jsonl', 'csv'], default='table', help='Output format')
     
     #Backup command
 
@@ -92,12 +106,276 @@ def main():
     parser_restore = subparsers.add_parser('restore', help='Restore the database from a backup')
     parser_restore.add_argument('backup_file', type=str, help='Path to the backup file')
     
+    # Stats command
+    parser_stats = subparsers.add_parser('stats', help='Show document counts and operation metrics')
+    parser_stats.add_argument('--reset', action='store_true', help='Reset the metrics after showing them')
+    
     # Info command
     parser_info = subparsers.add_parser("info", help="Show PieDB CLI information")
 
-    print('############### PieDB CLI! ###############\nType "exit" to quit cli.')
+    return parser
+
+
+def run_command(args: argparse.Namespace, DATABASE: Database) -> Database:
+    """Run one parsed command against the current database and return the (possibly new) current database."""
+
+    if args.command == 'database':
+        if args.db_command == 'init':
+            db_name = args.db_name
+            db = Database(db_name, instrument=True)
+            DATABASE = db
+            print(f"Database '{db_name}' initialized.")
+
+        elif args.db_command == 'drop':
+            if DATABASE is None:
+                print("No database initialized. Please initialize a database first.")
+                return DATABASE
+            db_name = args.db_name
+            if DATABASE.DB_FILE != db_name + DATABASE.EXT:
+                print(f"Confirm database name to drop: {db_name}")
+                return DATABASE
+            result = DATABASE.drop_db()
+            print(f"Database '{db_name}' dropped.")
+
+        elif args.db_command == 'list':
+            if DATABASE is None:
+                print("No database initialized. Please initialize a database first.")
+                return DATABASE
+            result = DATABASE.list()
+            print("Collections in the database :")
+            print(json.dumps(result, indent=4, cls=CustomJSONEncoder))
+
+        else:
+            print('Unknown database subcommand.')
+
+    elif args.command == 'collection':
+        if DATABASE is None:
+            print("No database initialized. Please initialize a database first.")
+            return DATABASE
+
+        if args.collection_command == 'create':
+            collection_name = args.collection_name
+            DATABASE.collection(collection_name)
+            print(f"Collection '{collection_name}' created.")
+
+        elif args.collection_command == 'drop':
+            collection_name = args.collection_name
+            result = DATABASE.drop_collection(collection_name)
+            print(f"Collection '{collection_name}' dropped.")
+
+        elif args.collection_command == 'set_schema':
+            collection_name = args.collection_name
+            safe_globals = {"__builtins__": {}, "str": str, "int": int, "bool": bool, "float": float, "datetime": datetime}
+            schema = eval(args.schema, safe_globals)
+            DATABASE.set_schema(collection_name, schema)
+            print(f"Schema for collection '{collection_name}' set.")
+
+        elif args.collection_command == 'get_schema':
+            collection_name = args.collection_name
+            schema = DATABASE.get_schema(collection_name)
+            print(f"Schema for collection '{collection_name}':")
+            print(json.dumps(schema, indent=4, default=str))
+
+        elif args.collection_command == 'get_data':
+            collection_name = args.collection_name
+            data = DATABASE.get_collection_data(collection_name)
+            print(f"Data for collection '{collection_name}':")
+            print(json.dumps(data, indent=4, cls=CustomJSONEncoder))
+
+        else:
+            print('Unknown collection subcommand.')
+
+    elif args.command == 'document':
+        if DATABASE is None:
+            print("No database initialized. Please initialize a database first.")
+            return DATABASE
+
+        if args.document_command == 'add':
+            collection_name = args.collection_name
+            document = json.loads(args.document)
+            ids = DATABASE.add(collection_name, document)
+            print(f"Document added to collection '{collection_name}': {ids}")
+
+        elif args.document_command == 'add_many':
+            collection_name = args.collection_name
+            documents = json.loads(args.documents)
+            ids = DATABASE.add_many(collection_name, documents)
+            print(f"Documents added to collection '{collection_name}': {ids}")
+            print(f"{len(documents)} documents added to collection '{collection_name}'.")
+
+        elif args.document_command == 'update':
+            collection_name = args.collection_name
+            update = json.loads(args.update)
+            query = json.loads(args.query)
+            limit = args.limit
+            result = DATABASE.update(collection_name, update, query, limit, return_docs=False)
+            print(f"Matched {result['matched']} and updated {result['modified']} documents in collection '{collection_name}'.")
+
+        elif args.document_command == 'delete':
+            collection_name = args.collection_name
+            query = json.loads(args.query)
+            limit = args.limit
+            deleted_docs = DATABASE.delete(collection_name, query, limit)
+            print(f"Deleted {len(deleted_docs)} documents from collection '{collection_name}'.")
+
+        else:
+            print('Unknown document subcommand.')
+
+    elif args.command == 'find':
+        if DATABASE is None:
+            print("No database initialized. Please initialize a database first.")
+            return DATABASE
+
+        collection_name = args.collection_name
+        query = json.loads(args.query) if args.query else {}
+        limit = args.limit
+        skip = args.skip
+        sort = args.sort
+        order = args.order
+
+        if sort:
+            results = DATABASE.find(collection_name, query, limit, skip, sort, order)
+        else:
+            stop = None if limit is None else skip + limit
+            results = itertools.islice(DATABASE.scan(collection_name, query), skip, stop)
+
+        count = print_documents(results, args.format, args.page_size)
+
+        if not count:
+            print("No matching documents found.")
+
+    elif args.command == 'backup':
+        if DATABASE is None:
+            print("No database initialized. Please initialize a database first.")
+            return DATABASE
+
+        backup_file = args.backup_file
+        DATABASE.backup_db(backup_file)
+        print(f"Database backed up to '{backup_file}'.")
+
+    elif args.command == 'restore':
+        if DATABASE is None:
+            print("No database initialized. Please initialize a database first.")
+            return DATABASE
+
+        backup_file = args.backup_file
+        DATABASE.restore_db(backup_file)
+        print(f"Database restored from '{backup_file}'.")
+
+    elif args.command == 'stats':
+        if DATABASE is None:
+            print("No database initialized. Please initialize a database first.")
+            return DATABASE
+
+        print("Collections :")
+        print(json.dumps(DATABASE.stats(), indent=4, cls=CustomJSONEncoder))
+        print("Metrics :")
+        print(json.dumps(DATABASE.metrics(reset=args.reset), indent=4, cls=CustomJSONEncoder))
+
+    elif args.command == 'info':
+        print("PieDB CLI - A simple JSON database CLI")
+        print("Version - 2.0.0")
+        print("Author - Shubham Kumar Gupta")
+        print("For more information, visit: https://pypi.org/project/piedb/")
+        print("View on Github - https://github.com/Shubham14243/piedb")
+        print("Use 'piedb <command> --help' for more information on a specific command.")
+
+    else:
+        print('Unknown Command.')
+
+    return DATABASE
+
+
+def _header(documents: list, header: list =None) -> list:
+    """Column names from a sample of documents, starting with _id and keeping any existing order."""
+
+    header = list(header) if header else ["_id"]
+    for doc in documents:
+        header += [key for key in doc if key not in header]
+    return header
+
+
+def _csv_header(documents: list) -> list:
+    """CSV columns from a sample of documents, plus the overflow column for keys that appear later."""
+
+    return [key for key in _header(documents) if key != CSV_EXTRA] + [CSV_EXTRA]
+
+
+def _csv_row(doc: dict, header: list) -> dict:
+    """Flatten a document into a CSV row. Keys without a column are kept as JSON in the overflow column."""
+
+    columns = set(header)
+    row = {}
+    extra = {}
+    for key, value in doc.items():
+        if key in columns and key != CSV_EXTRA:
+            row[key] = _cell(value)
+        else:
+            extra[key] = value
+    if extra:
+        row[CSV_EXTRA] = json.dumps(extra, cls=CustomJSONEncoder)
+    return row
 
-    DATABASE = None
+
+def _cell(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=CustomJSONEncoder)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def print_documents(documents, fmt: str ='table', page_size: int =20, out=None) -> int:
+    """Print documents page by page as they arrive. The header comes from the first page and grows with new keys."""
+
+    out = out or sys.stdout
+    interactive = fmt == 'table' and sys.stdin.isatty() and out.isatty()
+    documents = iter(documents)
+    header = None
+    writer = None
+    count = 0
+
+    while True:
+        page = list(itertools.islice(documents, max(1, page_size)))
+        if not page:
+            break
+
+        if fmt == 'jsonl':
+            for doc in page:
+                out.write(json.dumps(doc, cls=CustomJSONEncoder) + "\n")
+
+        elif fmt == 'csv':
+            if writer is None:
+                writer = csv.DictWriter(out, fieldnames=_csv_header(page))
+                writer.writeheader()
+            for doc in page:
+                writer.writerow(_csv_row(doc, writer.fieldnames))
+
+        else:
+            header = _header(page, header)
+            table = BeautifulTable()
+            table.set_style(BeautifulTable.STYLE_BOX_DOUBLED)
+            table.columns.header = header
+            for doc in page:
+                table.rows.append([_cell(doc.get(key, "")) for key in header])
+            print(table, file=out)
+
+        out.flush()
+        count += len(page)
+
+        if interactive and len(page) == page_size:
+            if input(f'-- {count} shown, Enter for more, q to stop -- ').strip().lower() == 'q':
+                break
+
+    return count
+
+
+def repl(DATABASE: Database =None) -> None:
+    """Interactive command loop."""
+
+    parser = build_parser()
+
+    print('############### PieDB CLI! ###############\nType "exit" to quit cli.')
 
     while True:
         try:
@@ -113,169 +391,239 @@ def main():
                 continue
 
             args = parser.parse_args(shlex.split(line))
-
-            if args.command == 'database':
-                if args.db_command == 'init':
-                    db_name = args.db_name
-                    db = Database(db_name)
-                    DATABASE = db
-                    print(f"Database '{db_name}' initialized.")
-
-                elif args.db_command == 'drop':
-                    if DATABASE is None:
-                        print("No database initialized. Please initialize a database first.")
-                        continue
-                    db_name = args.db_name
-                    if DATABASE.DB_FILE != db_name + DATABASE.EXT:
-                        print(f"Confirm database name to drop: {db_name}")
-                        continue
-                    result = DATABASE.drop_db()
-                    print(f"Database '{db_name}' dropped.")
-
-                elif args.db_command == 'list':
-                    if DATABASE is None:
-                        print("No database initialized. Please initialize a database first.")
-                        continue
-                    result = DATABASE.list()
-                    print("Collections in the database :")
-                    print(json.dumps(result, indent=4))
-
-                else:
-                    print('Unknown database subcommand.')
-                    
-            elif args.command == 'collection':
-                if DATABASE is None:
-                    print("No database initialized. Please initialize a database first.")
-                    continue
-
-                if args.collection_command == 'create':
-                    collection_name = args.collection_name
-                    DATABASE.collection(collection_name)
-                    print(f"Collection '{collection_name}' created.")
-
-                elif args.collection_command == 'drop':
-                    collection_name = args.collection_name
-                    result = DATABASE.drop_collection(collection_name)
-                    print(f"Collection '{collection_name}' dropped.")
-
-                elif args.collection_command == 'set_schema':
-                    collection_name = args.collection_name
-                    safe_globals = {"__builtins__": {}, "str": str, "int": int, "bool": bool, "float": float, "datetime": datetime}
-                    schema = eval(args.schema, safe_globals)
-                    DATABASE.set_schema(collection_name, schema)
-                    print(f"Schema for collection '{collection_name}' set.")
-
-                elif args.collection_command == 'get_schema':
-                    collection_name = args.collection_name
-                    schema = DATABASE.get_schema(collection_name)
-                    print(f"Schema for collection '{collection_name}':")
-                    print(json.dumps(schema, indent=4, default=str))
-
-                elif args.collection_command == 'get_data':
-                    collection_name = args.collection_name
-                    data = DATABASE.get_collection_data(collection_name)
-                    print(f"Data for collection '{collection_name}':")
-                    print(json.dumps(data, indent=4))
-                    
-                else:
-                    print('Unknown collection subcommand.')
-                    
-            elif args.command == 'document':
-                if DATABASE is None:
-                    print("No database initialized. Please initialize a database first.")
-                    continue
-
-                if args.document_command == 'add':
-                    collection_name = args.collection_name
-                    document = json.loads(args.document)
-                    ids = DATABASE.add(collection_name, document)
-                    print(f"Document added to collection '{collection_name}': {ids}")
-
-                elif args.document_command == 'add_many':
-                    collection_name = args.collection_name
-                    documents = eval(args.documents)
-                    ids = DATABASE.add_many(collection_name, documents)
-                    print(f"Documents added to collection '{collection_name}': {ids}")
-                    print(f"{len(documents)} documents added to collection '{collection_name}'.")
-
-                elif args.document_command == 'update':
-                    collection_name = args.collection_name
-                    update = json.loads(args.update)
-                    query = json.loads(args.query)
-                    limit = args.limit
-                    updated_docs = DATABASE.update(collection_name, update, query, limit)
-                    print(f"Updated {len(updated_docs)} documents in collection '{collection_name}'.")
-
-                elif args.document_command == 'delete':
-                    collection_name = args.collection_name
-                    query = json.loads(args.query)
-                    limit = args.limit
-                    deleted_docs = DATABASE.delete(collection_name, query, limit)
-                    print(f"Deleted {len(deleted_docs)} documents from collection '{collection_name}'.")
-                
-                else:
-                    print('Unknown document subcommand.')
-                    
-            elif args.command == 'find':
-                if DATABASE is None:
-                    print("No database initialized. Please initialize a database first.")
-                    continue
-                
-                collection_name = args.collection_name
-                query = eval(args.query) if args.query else {}
-                limit = args.limit
-                skip = args.skip
-                sort = args.sort
-                order = args.order
-
-                results = DATABASE.find(collection_name, query, limit, skip, sort, order)
-                
-                if not results:
-                    print("No matching documents found.")
-                    continue
-
-                table = BeautifulTable()
-                table.set_style(BeautifulTable.STYLE_BOX_DOUBLED)
-                table.columns.header = ["_id"] + [key for key in results[0] if key != "_id"]
-
-                for doc in results:
-                    table.rows.append([doc["_id"]] + [doc[key] for key in doc if key != "_id"])
-
-                print(table)
-                
-            elif args.command == 'backup':
-                if DATABASE is None:
-                    print("No database initialized. Please initialize a database first.")
-                    continue
-                
-                backup_file = args.backup_file
-                DATABASE.backup_db(backup_file)
-                print(f"Database backed up to '{backup_file}'.")
-
-            elif args.command == 'restore':
-                if DATABASE is None:
-                    print("No database initialized. Please initialize a database first.")
-                    continue
-
-                backup_file = args.backup_file
-                DATABASE.restore_db(backup_file)
-                print(f"Database restored from '{backup_file}'.")
-                
-            elif args.command == 'info':
-                print("PieDB CLI - A simple JSON database CLI")
-                print("Version - 2.0.0")
-                print("Author - Shubham Kumar Gupta")
-                print("For more information, visit: https://pypi.org/project/piedb/")
-                print("View on Github - https://github.com/Shubham14243/piedb")
-                print("Use 'piedb <command> --help' for more information on a specific command.")
-
-            else:
-                print('Unknown Command.')
+            DATABASE = run_command(args, DATABASE)
 
         except SystemExit:
             pass
         except Exception as e:
             print(f"Error: {str(e)}")
 
+
+def run_script(path: str, DATABASE: Database =None) -> int:
+    """Run commands from a script file ('-' for stdin), one per line. Stops at the first error."""
+
+    parser = build_parser()
+    f = sys.stdin if path == '-' else open(path, "r")
+
+    try:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                args = parser.parse_args(shlex.split(line))
+                DATABASE = run_command(args, DATABASE)
+            except SystemExit:
+                print(f"Error: line {number}: invalid command: {line}", file=sys.stderr)
+                return 1
+            except Exception as e:
+                print(f"Error: line {number}: {str(e)}", file=sys.stderr)
+                return 1
+    finally:
+        if f is not sys.stdin:
+            f.close()
+        if DATABASE is not None:
+            DATABASE.close()
+
+    return 0
+
+
+class Progress:
+    """Throttled progress and throughput reporting on stderr."""
+
+    def __init__(self, label: str, interval: float =1.0) -> None:
+        self.label = label
+        self.interval = interval
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.count = 0
+
+    def __call__(self, count: int) -> None:
+        self.count = count
+        now = time.perf_counter()
+        if now - self.last >= self.interval:
+            self.last = now
+            self._report(now)
+
+    def _report(self, now: float, end: str ="\n") -> None:
+        elapsed = now - self.start
+        rate = self.count / elapsed if elapsed > 0 else 0
+        print(f"{self.label}: {self.count} documents in {elapsed:.1f}s ({rate:.0f} docs/s)", file=sys.stderr, end=end)
+
+    def done(self) -> None:
+        self._report(time.perf_counter())
+
+
+def _format_from_path(path: str, fmt: str) -> str:
+    if fmt:
+        return fmt
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+
+def _coerce_csv_row(row: dict, schema: dict) -> dict:
+    """Convert CSV string values to the collection's schema types. Empty cells are dropped."""
+
+    document = {}
+    extra = row.pop(CSV_EXTRA, None)
+    for key, value in row.items():
+        if value is None or value == '':
+            continue
+        field_type = schema.get(key)
+        if field_type is int:
+            value = int(value)
+        elif field_type is float:
+            value = float(value)
+        elif field_type is bool:
+            value = value.strip().lower() in ('1', 'true', 'yes', 'y')
+        elif field_type in (dict, list):
+            value = json.loads(value)
+        document[key] = value
+    if extra:
+        document.update(json.loads(extra))
+    return document
+
+
+def _read_documents(f, fmt: str, schema: dict):
+    """Yield documents from a JSONL or CSV stream one at a time."""
+
+    if fmt == 'csv':
+        for row in csv.DictReader(f):
+            yield _coerce_csv_row(row, schema)
+    else:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"line {number}: {e}")
+
+
+def import_collection(db: Database, collection: str, path: str, fmt: str =None, chunk_size: int =1000) -> int:
+    """Stream documents from a JSONL or CSV file ('-' for stdin) into a collection."""
+
+    fmt = _format_from_path(path, fmt)
+    db.collection(collection)
+    schema = db.get_schema(collection)
+    progress = Progress(f"import {collection}")
+
+    f = sys.stdin if path == '-' else open(path, "r", newline='' if fmt == 'csv' else None)
+    try:
+        count = db.add_stream(collection, _read_documents(f, fmt, schema), chunk_size, progress)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+    progress.done()
+    return count
+
+
+def export_collection(db: Database, collection: str, out, fmt: str ='jsonl', query: dict =None, sample_size: int =100) -> int:
+    """Write a collection as JSONL or CSV using an incremental scan."""
+
+    documents = db.scan(collection, query)
+    progress = Progress(f"export {collection}")
+    count = 0
+
+    if fmt == 'csv':
+        sample = []
+        for doc in documents:
+            sample.append(doc)
+            if len(sample) >= sample_size:
+                break
+
+        writer = csv.DictWriter(out, fieldnames=_csv_header(sample))
+        writer.writeheader()
+
+        def rows():
+            yield from sample
+            yield from documents
+
+        for doc in rows():
+            writer.writerow(_csv_row(doc, writer.fieldnames))
+            count += 1
+            if count % 1000 == 0:
+                progress(count)
+    else:
+        for doc in documents:
+            out.write(json.dumps(doc, cls=CustomJSONEncoder) + "\n")
+            count += 1
+            if count % 1000 == 0:
+                progress(count)
+
+    progress.count = count
+    progress.done()
+    return count
+
+
+def main(argv: list =None) -> int:
+
+    parser = argparse.ArgumentParser(description="PieDB CLI - A simple JSON database CLI", prog="piedb")
+    parser.add_argument('--db', type=str, default=None, help='Database to open (default for import/export: "database")')
+
+    subparsers = parser.add_subparsers(dest='mode')
+
+    parser_exec = subparsers.add_parser('exec', help='Run CLI commands from a script file')
+    parser_exec.add_argument('script', type=str, help="Script file with one command per line ('-' for stdin)")
+
+    parser_import = subparsers.add_parser('import', help='Import documents from a JSONL or CSV file')
+    parser_import.add_argument('collection_name', type=str, help='Name of the collection')
+    parser_import.add_argument('file', type=str, help="JSONL or CSV file ('-' for stdin)")
+    parser_import.add_argument('--format', type=str, choices=['jsonl', 'csv'], default=None, help='Input format (default: from the file extension)')
+    parser_import.add_argument('--chunk-size', type=int, default=1000, help='Documents per insert chunk')
+
+    parser_export = subparsers.add_parser('export', help='Export a collection as JSONL or CSV')
+    parser_export.add_argument('collection_name', type=str, help='Name of the collection')
+    parser_export.add_argument('--format', type=str, choices=['jsonl', 'csv'], default='jsonl', help='Output format')
+    parser_export.add_argument('--query', type=str, default=None, help='Query to match documents in JSON format')
+    parser_export.add_argument('--out', type=str, default='-', help="Output file ('-' for stdout)")
+
+    parser_serve = subparsers.add_parser('serve', help='Serve the database to many clients over a socket')
+    parser_serve.add_argument('--socket', type=str, default=None, help='Unix socket path to listen on')
+    parser_serve.add_argument('--host', type=str, default='127.0.0.1', help='TCP host to listen on')
+    parser_serve.add_argument('--port', type=int, default=None, help='TCP port to listen on')
+    parser_serve.add_argument('--flush-interval', type=float, default=None, help='Write-behind flush interval in seconds')
+    parser_serve.add_argument('--allow-admin', action='store_true', help='Allow clients to call drop_db, backup_db and restore_db')
+
+    args = parser.parse_args(argv)
+
+    if args.mode is None:
+        repl(Database(args.db, instrument=True) if args.db else None)
+        return 0
+
+    if args.mode == 'exec':
+        return run_script(args.script, Database(args.db, instrument=True) if args.db else None)
+
+    if args.mode == 'serve':
+        if not args.socket and args.port is None:
+            parser.error("serve requires --socket or --port")
+        serve(args.db or "database", args.socket, args.host, args.port, args.flush_interval, args.allow_admin)
+        return 0
+
+    db = Database(args.db or "database")
+    try:
+        if args.mode == 'import':
+            count = import_collection(db, args.collection_name, args.file, args.format, args.chunk_size)
+            print(f"Imported {count} documents into collection '{args.collection_name}'.", file=sys.stderr)
+
+        elif args.mode == 'export':
+            query = json.loads(args.query) if args.query else None
+            out = sys.stdout if args.out == '-' else open(args.out, "w", newline='')
+            try:
+                count = export_collection(db, args.collection_name, out, args.format, query)
+            finally:
+                if out is not sys.stdout:
+                    out.close()
+            print(f"Exported {count} documents from collection '{args.collection_name}'.", file=sys.stderr)
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+    return 0
+
+
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,165 @@
+import time
+import socket
+import builtins
+import itertools
+from queue import Empty
+from queue import LifoQueue
+from threading import Lock
+
+from . import error
+from .db import Database
+from .protocol import encode
+from .protocol import recv_frame
+
+
+class RemoteDatabase:
+    """Client for a `piedb serve` process with the same methods as Database."""
+
+    METHODS = Database.PUBLIC_METHODS + ["metrics"]
+
+    def __init__(self, socket_path: str =None, host: str ="127.0.0.1", port: int =None, pool_size: int =4, timeout: float =None) -> None:
+        """Connect lazily to a server on a Unix socket path or a TCP host/port."""
+
+        if not socket_path and port is None:
+            raise ValueError("Either a socket path or a TCP port is required.")
+
+        self.SOCKET_PATH = socket_path
+        self.ADDRESS = (host, port)
+        self.TIMEOUT = timeout
+        self._pool = LifoQueue(maxsize=pool_size)
+        self._ids = itertools.count(1)
+        self._ids_lock = Lock()
+
+    def _connect(self) -> socket.socket:
+        if self.SOCKET_PATH:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.TIMEOUT)
+            sock.connect(self.SOCKET_PATH)
+        else:
+            sock = socket.create_connection(self.ADDRESS, timeout=self.TIMEOUT)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    def _acquire(self) -> socket.socket:
+        try:
+            return self._pool.get_nowait()
+        except Empty:
+            return self._connect()
+
+    def _release(self, sock: socket.socket) -> None:
+        try:
+            self._pool.put_nowait(sock)
+        except Exception:
+            sock.close()
+
+    def _next_id(self) -> int:
+        with self._ids_lock:
+            return next(self._ids)
+
+    def _raise(self, response: dict) -> None:
+        """Re-raise a server-side error as the same exception type where possible."""
+
+        name, message = response.get("error"), response.get("message")
+        cls = getattr(error, name, None) or getattr(builtins, name, None)
+        if not (isinstance(cls, type) and issubclass(cls, Exception)):
+            raise RuntimeError(f"{name}: {message}")
+        exc = cls.__new__(cls)
+        Exception.__init__(exc, message)
+        exc.message = message
+        raise exc
+
+    def pipeline(self, calls: list) -> list:
+        """Send several (method, args, kwargs) calls on one connection before reading any reply.
+
+        Returns the results in order. Failed calls are returned as exception instances, not raised."""
+
+        requests = []
+        for method, args, kwargs in calls:
+            requests.append({"id": self._next_id(), "method": method, "args": list(args), "kwargs": kwargs})
+
+        sock = self._acquire()
+        try:
+            sock.sendall(b"".join(encode(request) for request in requests))
+            responses = [recv_frame(sock) for _ in requests]
+        except Exception:
+            sock.close()
+            raise
+        if any(response is None for response in responses):
+            sock.close()
+            raise ConnectionError("Connection closed by the PieDB server.")
+        self._release(sock)
+
+        results = []
+        for response in responses:
+            if response["ok"]:
+                results.append(response["result"])
+            else:
+                try:
+                    self._raise(response)
+                except Exception as e:
+                    results.append(e)
+        return results
+
+    def _call(self, method: str, *args, **kwargs):
+        request = {"id": self._next_id(), "method": method, "args": list(args), "kwargs": kwargs}
+
+        sock = self._acquire()
+        try:
+            sock.sendall(encode(request))
+            response = recv_frame(sock)
+        except Exception:
+            sock.close()
+            raise
+        if response is None:
+            sock.close()
+            raise ConnectionError("Connection closed by the PieDB server.")
+        self._release(sock)
+
+        if not response["ok"]:
+            self._raise(response)
+        return response["result"]
+
+    def scan(self, collection: str, query: dict =None):
+        """Yield matching documents. The server returns them in one reply."""
+
+        yield from self._call("find", collection, query)
+
+    def watch(self, collection: str =None, query: dict =None, since: int =None, timeout: float =None, poll_interval: float =0.1):
+        """Yield change events by polling the server's change feed. Stops after `timeout` seconds without events."""
+
+        if since is None:
+            since = self._call("changes", collection, query, None)["seq"]
+        idle = time.monotonic()
+
+        while True:
+            result = self._call("changes", collection, query, since)
+            for event in result["events"]:
+                yield event
+            if result["events"]:
+                idle = time.monotonic()
+            since = max(since, result["seq"])
+            if timeout is not None and time.monotonic() - idle >= timeout:
+                return
+            time.sleep(poll_interval)
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except Empty:
+                break
+
+
+def _remote_method(name: str):
+    def method(self, *args, **kwargs):
+        return self._call(name, *args, **kwargs)
+
+    method.__name__ = name
+    method.__doc__ = getattr(Database, name).__doc__
+    return method
+
+
+for _name in RemoteDatabase.METHODS:
+    setattr(RemoteDatabase, _name, _remote_method(_name))
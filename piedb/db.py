@@ -1,8 +1,24 @@
 import os
+import re
 import json
+import time
+import atexit
+import pickle
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from threading import Event
 from threading import RLock
+from threading import Thread
 from datetime import datetime
 
+from .row import Row
+from .cache import QueryCache
+from .changes import ChangeFeed
+from .metrics import Metrics
+from .metrics import TimedLock
 from .util import Utility
 from .util import CustomJSONEncoder
 from .error import CollectionNotFoundError
@@ -13,8 +29,11 @@ from .error import UnsupportedOperatorError
 
 class Database:
     
+    PUBLIC_METHODS = ["drop_db", "list", "set_schema", "get_schema", "get_count", "collection", "drop_collection",
+                      "get_collection_data", "add", "add_many", "add_stream", "find", "update", "delete", "compact", "stats",
+                      "cache_stats", "changes", "flush", "backup_db", "restore_db"]
     
-    def __init__(self, db_file: str ="database") -> None:
+    def __init__(self, db_file: str ="database", compact_threshold: float =0.25, flush_interval: float =None, max_pending: int =1000, instrument: bool =False, metrics_hook=None, parallel_threshold: int =50000, query_cache_bytes: int =0, change_buffer: int =1000) -> None:
         """Initialize the Database"""
         
         self.EXT = ".json"
@@ -25,35 +44,308 @@ class Database:
             self.DB_FILE = db_file + self.EXT
         self.PATH = os.getcwd()
         self.LOCK = RLock()
-
-        self.SKELETON = {"_meta": {"_version": self.VERSION, "_path": self.PATH, "_count": {}, "_schema": {}}}
-        self.RESERVED_KEYS = ["_meta", "_version", "_path", "_count", "_schema", "_id_"]
+        self.COMPACT_THRESHOLD = compact_threshold
+
+        self.SKELETON = {"_meta": {"_version": self.VERSION, "_path": self.PATH, "_count": {}, "_schema": {}, "_dead": {}}}
+        self.RESERVED_KEYS = ["_meta", "_version", "_path", "_count", "_schema", "_dead", "_deleted", "_id_"]
+        self.UPDATE_OPERATORS = ["$set", "$inc", "$push", "$unset"]
+
+        self._cache = None
+        self._cache_stamp = None
+
+        self.FLUSH_INTERVAL = flush_interval
+        self.MAX_PENDING = max_pending
+        self._pending = 0
+        self._closed = Event()
+        self._flusher = None
+        self._flush_error = None
+
+        self.PARALLEL_THRESHOLD = parallel_threshold
+        self._query_cache = QueryCache(query_cache_bytes) if query_cache_bytes > 0 else None
+        self._changes = ChangeFeed(change_buffer) if change_buffer > 0 else None
+        self._executor = None
+        self._executor_workers = None
+        self._parallel_lock = Lock()
+        self._snapshots = {}
+        self._versions = {}
+        self._epoch = 0
+
+        self._metrics = None
+        if instrument or metrics_hook is not None:
+            self._metrics = Metrics(metrics_hook)
+            self.LOCK = TimedLock(self.LOCK, self._metrics)
+            for name in self.PUBLIC_METHODS:
+                setattr(self, name, self._metrics.wrap(name, getattr(self, name)))
 
         if not os.path.exists(self.DB_FILE):
             with open(self.DB_FILE, "w") as f:
                 json.dump(self.SKELETON, f, indent=4)
 
+        if self.FLUSH_INTERVAL is not None:
+            self._flusher = Thread(target=self._flush_loop, name="piedb-flusher", daemon=True)
+            self._flusher.start()
+            atexit.register(self.close)
+
+
+    def _file_stamp(self) -> tuple:
+        """Identify the current version of the database file on disk."""
+        
+        stat = os.stat(self.DB_FILE)
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
 
     def _read_db(self) -> dict:
-        """Read the database from the file."""
+        """Read the database, reusing the decoded in-memory copy while the file is unchanged."""
         
         with self.LOCK:
+            if self._pending:
+                if self._metrics is not None:
+                    self._metrics.record_cache_hit()
+                return self._cache
+            
+            stamp = self._file_stamp()
+            if self._cache is not None and stamp == self._cache_stamp:
+                if self._metrics is not None:
+                    self._metrics.record_cache_hit()
+                return self._cache
+            
+            start = time.perf_counter()
             with open(self.DB_FILE, "r") as f:
-                return json.load(f)
+                db = self._parse_db(f.read())
+            if self._metrics is not None:
+                self._metrics.record_io("read", stamp[1], time.perf_counter() - start)
+            
+            for collection in db:
+                if collection != "_meta":
+                    self._load_collection(db, collection, fresh=True)
+            self._epoch += 1
+            
+            if self._query_cache is not None:
+                self._query_cache.clear()
+            
+            self._cache = db
+            self._cache_stamp = stamp
+            return db
 
 
     def _write_db(self, data: dict) -> None:
-        """Write the database to the file."""
+        """Write the database to the file, or mark it dirty for the flusher when flush_interval is set."""
         
         with self.LOCK:
-            with open(self.DB_FILE, "w") as f:
-                json.dump(data, f, indent=4, cls=CustomJSONEncoder)
+            self._cache = data
+            
+            if self.FLUSH_INTERVAL is None:
+                self._pending = 1
+                self._flush()
+                return
+            
+            self._pending += 1
+            if self._pending >= self.MAX_PENDING:
+                self._flush()
+
+
+    def _flush(self) -> None:
+        """Write the in-memory database to the file if it has unflushed changes."""
+        
+        with self.LOCK:
+            if not self._pending:
+                return
+            
+            # Serialize fully, then swap the file in, so a failure or a kill never leaves a truncated database
+            start = time.perf_counter()
+            data = json.dumps(self._cache, indent=4, cls=CustomJSONEncoder)
+            temp_file = self.DB_FILE + ".tmp"
+            with open(temp_file, "w") as f:
+                f.write(data)
+            os.replace(temp_file, self.DB_FILE)
+            
+            self._pending = 0
+            self._cache_stamp = self._file_stamp()
+            if self._metrics is not None:
+                self._metrics.record_io("write", self._cache_stamp[1], time.perf_counter() - start)
+
+
+    def _flush_loop(self) -> None:
+        """Background flusher: write dirty state every FLUSH_INTERVAL seconds until closed."""
+        
+        while not self._closed.wait(self.FLUSH_INTERVAL):
+            try:
+                self._flush()
+            except Exception as e:
+                if repr(e) != repr(self._flush_error):
+                    logging.getLogger(__name__).error("Background flush of '%s' failed", self.DB_FILE, exc_info=e)
+                self._flush_error = e
+
+
+    def flush(self) -> None:
+        """Write all unflushed changes to the database file.
+        
+        Raises the background flusher's last error if the changes still cannot be written."""
+        
+        try:
+            self._flush()
+        except Exception:
+            self._flush_error = None
+            raise
+        self._flush_error = None
+
+
+    def close(self) -> None:
+        """Flush unflushed changes and stop the background flusher."""
+        
+        self._closed.set()
+        if self._changes is not None:
+            self._changes.close()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+            atexit.unregister(self.close)
+        
+        with self._parallel_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+            self._release_snapshots()
+        
+        if os.path.exists(self.DB_FILE):
+            self._flush()
+
+
+    @staticmethod
+    def _schema_layout(schema: dict) -> type:
+        """Return the shared Row class for a schema, or None without a schema."""
+        
+        if not schema:
+            return None
+        names = tuple(schema)
+        return Row.layout(names if "_id" in schema else names + ("_id",))
+
+
+    def _row_layout(self, db: dict, collection: str) -> type:
+        """Return the shared Row class for a schema-bound collection, or None without a schema."""
+        
+        return self._schema_layout(db["_meta"].get("_schema", {}).get(collection))
+
+
+    def _parse_db(self, text: str) -> dict:
+        """Parse the database file, building rows for schema-bound documents while parsing.
+        
+        The _meta object is written first, so it is parsed on its own to learn the schemas. Stored
+        documents whose keys match a schema's fields in order then become rows directly instead of
+        dicts, so the full set of dicts never exists at once."""
+        
+        start = re.match(r'\s*\{\s*"_meta"\s*:\s*', text)
+        if start is None:
+            return json.loads(text)
+        
+        meta = json.JSONDecoder().raw_decode(text, start.end())[0]
+        layouts = {}
+        for schema in meta.get("_schema", {}).values():
+            layout = self._schema_layout(schema)
+            if layout is not None:
+                layouts[layout._names] = layout
+        if not layouts:
+            return json.loads(text)
+        
+        def build(pairs):
+            if pairs and pairs[-1][0] == "_id":
+                layout = layouts.get(tuple([key for key, _ in pairs]))
+                if layout is not None:
+                    return layout(pairs)
+            return dict(pairs)
+        
+        return json.loads(text, object_pairs_hook=build)
+
+
+    def _load_collection(self, db: dict, collection: str, fresh: bool =False) -> None:
+        """Decode schema-typed fields stored as strings (ISO datetimes) into native types and pack documents into rows.
+        
+        Documents are copied before decoding unless they were just parsed (fresh), so snapshots held by readers are never changed."""
+        
+        schema = db["_meta"].get("_schema", {}).get(collection)
+        if not schema:
+            db[collection] = [dict(doc) if isinstance(doc, Row) else doc for doc in db[collection]]
+            return
+        
+        fields = [field for field, field_type in schema.items() if field_type == "datetime"]
+        layout = self._row_layout(db, collection)
+        
+        documents = []
+        for doc in db[collection]:
+            if doc.get("_deleted"):
+                documents.append(doc)
+                continue
+            if type(doc) is not layout:
+                doc = layout(doc)
+            elif not fresh and fields:
+                doc = doc.copy()
+            for field in fields:
+                value = doc.get(field)
+                if isinstance(value, str):
+                    try:
+                        doc[field] = Utility.naive_utc(datetime.fromisoformat(value))
+                    except ValueError:
+                        pass
+            documents.append(doc)
+        db[collection] = documents
+
+
+    def _decode_query(self, collection: str, query: dict) -> dict:
+        """Convert ISO string and datetime values in a query to naive UTC datetimes for datetime-typed fields."""
+        
+        if not query:
+            return query
+        
+        schema = self.get_schema(collection)
+        fields = {field for field, field_type in schema.items() if field_type is datetime}
+        if not fields:
+            return query
+        
+        def decode(value):
+            if isinstance(value, str):
+                try:
+                    return Utility.naive_utc(datetime.fromisoformat(value))
+                except ValueError:
+                    return value
+            if isinstance(value, datetime):
+                return Utility.naive_utc(value)
+            if isinstance(value, list):
+                return [decode(item) for item in value]
+            return value
+        
+        decoded = {}
+        for k, v in query.items():
+            if k in ('$or', '$and') and isinstance(v, list):
+                decoded[k] = [self._decode_query(collection, subquery) for subquery in v]
+            elif k in fields:
+                if isinstance(v, dict):
+                    decoded[k] = {operator: decode(value) for operator, value in v.items()}
+                else:
+                    decoded[k] = decode(v)
+            else:
+                decoded[k] = v
+        return decoded
+
+
+    def _changed(self, collection: str, op: str =None, documents: list =None) -> None:
+        """Record a write to a collection: stop serving its cached query results and publish change events."""
+        
+        self._versions[collection] = self._versions.get(collection, 0) + 1
+        if self._query_cache is not None:
+            self._query_cache.invalidate(collection)
+        if op is not None and self._changes is not None:
+            self._changes.publish(op, collection, documents)
 
 
     def drop_db(self) -> bool:
         """Delete the entire database file."""
         
         with self.LOCK:
+            if self._query_cache is not None:
+                self._query_cache.clear()
+            self._cache = None
+            self._cache_stamp = None
+            self._pending = 0
             if os.path.exists(self.DB_FILE):
                 os.remove(self.DB_FILE)
                 return True
@@ -78,7 +370,9 @@ class Database:
                 
             db = self._read_db()
             db["_meta"]["_schema"][collection] = schema_str
+            self._load_collection(db, collection)
             self._write_db(db)
+            self._changed(collection)
 
 
     def get_schema(self, collection: str) -> dict:
@@ -97,7 +391,8 @@ class Database:
         """Initialize or Update the count for a collection."""
         with self.LOCK:
             db = self._read_db()
-            db["_meta"]["_count"][collection] = len(db[collection])
+            dead = db["_meta"].setdefault("_dead", {}).setdefault(collection, 0)
+            db["_meta"]["_count"][collection] = len(db[collection]) - dead
             self._write_db(db)
     
     
@@ -150,8 +445,10 @@ class Database:
                 db = self._read_db()
                 db["_meta"]["_schema"].pop(collection, None)
                 db["_meta"]["_count"].pop(collection, None)
+                db["_meta"].get("_dead", {}).pop(collection, None)
                 db.pop(collection, None)
                 self._write_db(db)
+                self._changed(collection)
                 return True
                 
             except Exception as e:
@@ -168,18 +465,19 @@ class Database:
             db = self._read_db()
             collection_schema = db["_meta"]["_schema"][collection]
             collection_count = db["_meta"]["_count"][collection]
-            data = db[collection][:5]
-            return {collection: {"_schema": collection_schema, "count": collection_count, "data": data}}
+            data = [Utility.copy_document(doc) for doc in db[collection] if not doc.get("_deleted")][:5]
+            return {collection: {"_schema": dict(collection_schema), "count": collection_count, "data": data}}
 
 
-    def _validate_document(self, collection: str, document: dict) -> bool:
+    def _validate_document(self, collection: str, document: dict, schema: dict =None) -> bool:
         """Validate a document against the collection's schema."""
         
         for key in document.keys():
             if key in self.RESERVED_KEYS:
                 raise ReservedKeyError(f"'{key}' {self.RESERVED_KEYS} are reserved keys.")
         
-        schema = self.get_schema(collection)
+        if schema is None:
+            schema = self.get_schema(collection)
         if not schema:
             return True
 
@@ -195,6 +493,7 @@ class Database:
                         document[field] = datetime.fromisoformat(document[field])
                     except ValueError:
                         raise DocumentValidationError(f"Field '{field}' must be a valid ISO 8601 datetime string.")
+                document[field] = Utility.naive_utc(document[field])
             elif not isinstance(document[field], field_type):
                 raise DocumentValidationError(f"Field '{field}' must be of type {field_type.__name__}.")
         return True
@@ -215,9 +514,12 @@ class Database:
 
             unique_id = Utility.generate_id(collection)
             document.setdefault("_id", unique_id)
-            db[collection].append(document)
+            layout = self._row_layout(db, collection)
+            stored = Utility.copy_document(document)
+            db[collection].append(layout(stored) if layout else stored)
         
             self._write_db(db)
+            self._changed(collection, "insert", db[collection][-1:])
             
             self._set_count(collection)
 
@@ -231,25 +533,77 @@ class Database:
             self._validate_collection_exists(collection)
             
             db = self._read_db()
+            schema = self.get_schema(collection)
             added_ids = []
 
             for document in documents:
                 try:
-                    self._validate_document(collection, document)
-                    unique_id = Utility.generate_id(collection)
-                    document.setdefault("_id", unique_id)
-                    db[collection].append(document)
-                    added_ids.append(unique_id)
+                    self._validate_document(collection, document, schema)
                 except DocumentValidationError as e:
                     raise e
+
+            layout = self._row_layout(db, collection)
+            for document in documents:
+                unique_id = Utility.generate_id(collection)
+                document.setdefault("_id", unique_id)
+                stored = Utility.copy_document(document)
+                db[collection].append(layout(stored) if layout else stored)
+                added_ids.append(unique_id)
             
             self._write_db(db)
+            self._changed(collection, "insert", db[collection][-len(documents):] if documents else [])
             self._set_count(collection)
 
             return added_ids
 
 
-    def _evaluate_condition(self, doc_value: any, condition: dict) -> bool:
+    def add_stream(self, collection: str, documents, chunk_size: int =1000, progress=None) -> int:
+        """Add documents from any iterable in chunks, writing the database once at the end.
+        
+        Each chunk is validated before it is appended. If a chunk fails validation, the chunks
+        already added are kept and written. progress(count) is called after every chunk."""
+        
+        with self.LOCK:
+            self._validate_collection_exists(collection)
+            
+            db = self._read_db()
+            schema = self.get_schema(collection)
+            layout = self._row_layout(db, collection)
+            added_count = 0
+            chunk = []
+            
+            def append_chunk() -> int:
+                for document in chunk:
+                    self._validate_document(collection, document, schema)
+                for document in chunk:
+                    document.setdefault("_id", Utility.generate_id(collection))
+                    stored = Utility.copy_document(document)
+                    db[collection].append(layout(stored) if layout else stored)
+                count = len(chunk)
+                chunk.clear()
+                if progress is not None:
+                    progress(added_count + count)
+                return count
+            
+            try:
+                for document in documents:
+                    chunk.append(document)
+                    if len(chunk) >= chunk_size:
+                        added_count += append_chunk()
+                if chunk:
+                    added_count += append_chunk()
+            finally:
+                if added_count:
+                    dead = db["_meta"].setdefault("_dead", {}).get(collection, 0)
+                    db["_meta"]["_count"][collection] = len(db[collection]) - dead
+                    self._write_db(db)
+                    self._changed(collection, "insert", db[collection][-added_count:])
+            
+            return added_count
+
+
+    @staticmethod
+    def _evaluate_condition(doc_value: any, condition: dict) -> bool:
         """Evaluate a condition (support for $gt, $lt, $ne, $eq)."""
         
         if doc_value is None:
@@ -276,103 +630,335 @@ class Database:
         return True
 
 
-    def find(self, collection: str, query: dict =None, limit: int =None, skip: int =0, sort: str =None, order: str ="asc") -> list:
+    @staticmethod
+    def _match_document(doc: dict, query: dict) -> bool:
+        """Check whether a document satisfies every clause of a query."""
+        
+        for k, v in query.items():
+            if k == '$or' and isinstance(v, list):
+                match = any(
+                    all(Database._evaluate_condition(doc.get(field), cond) for field, cond in subquery.items())
+                    for subquery in v
+                )
+            elif k == '$and' and isinstance(v, list):
+                match = all(
+                    all(Database._evaluate_condition(doc.get(field), cond) for field, cond in subquery.items())
+                    for subquery in v
+                )
+            else:
+                match = Database._evaluate_condition(doc.get(k), v)
+
+            if not match:
+                return False
+        return True
+
+
+    def _use_parallel(self, documents: list, query: dict, parallel: bool, workers: int) -> bool:
+        """Use the process pool only when asked to and the collection is large enough to pay for it."""
+        
+        return bool(query) and bool(parallel or workers) and len(documents) >= self.PARALLEL_THRESHOLD
+
+
+    def _snapshot_key(self, collection: str) -> tuple:
+        """Identify the current contents of a collection. Changes on every write and every reload of the file."""
+        
+        return (self._epoch, self._versions.get(collection, 0))
+
+
+    def _release_snapshots(self) -> None:
+        """Free the shared memory holding parallel query snapshots."""
+        
+        for _, shm, _ in self._snapshots.values():
+            shm.close()
+            shm.unlink()
+        if self._snapshots:
+            atexit.unregister(self._release_snapshots)
+        self._snapshots = {}
+
+
+    def _parallel_match(self, collection: str, key: tuple, documents: list, query: dict, workers: int =None) -> list:
+        """Evaluate a query over chunks of documents in a persistent process pool. Returns matching positions in original order.
+        
+        The collection is pickled into shared memory once per version (key). Each worker unpickles it once and is
+        then sent only chunk boundaries. Workers are started with forkserver or spawn, never by forking this process."""
+        
+        workers = workers or os.cpu_count() or 1
+        size = max(1, -(-len(documents) // (workers * 4)))
+        
+        with self._parallel_lock:
+            if self._executor is None or self._executor_workers != workers:
+                if self._executor is not None:
+                    self._executor.shutdown()
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+                self._executor_workers = workers
+            
+            snapshot = self._snapshots.get(collection)
+            if snapshot is None or snapshot[0] != key:
+                data = pickle.dumps([dict(doc) if isinstance(doc, Row) else doc for doc in documents], protocol=pickle.HIGHEST_PROTOCOL)
+                # Imported here: shared_memory needs Python 3.8+, and piedb itself supports older versions
+                from multiprocessing import shared_memory
+                shm = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+                shm.buf[:len(data)] = data
+                if not self._snapshots:
+                    atexit.register(self._release_snapshots)
+                if snapshot is not None:
+                    snapshot[1].close()
+                    snapshot[1].unlink()
+                snapshot = (key, shm, len(data))
+                self._snapshots[collection] = snapshot
+            
+            try:
+                futures = [self._executor.submit(_match_range, collection, snapshot[1].name, snapshot[2], query, offset, size)
+                           for offset in range(0, len(documents), size)]
+                positions = []
+                for future in futures:
+                    positions.extend(future.result())
+                return positions
+            except BrokenProcessPool:
+                # Start a fresh pool on the next call instead of failing forever
+                self._executor.shutdown(wait=False)
+                self._executor = None
+                raise
+
+
+    def find(self, collection: str, query: dict =None, limit: int =None, skip: int =0, sort: str =None, order: str ="asc", parallel: bool =False, workers: int =None) -> list:
     
+        # Only the snapshot is taken under the lock. Writers never change a stored document in place,
+        # so concurrent finds can match the snapshot while other calls proceed.
         with self.LOCK:
             self._validate_collection_exists(collection)
             db = self._read_db()
+            query = self._decode_query(collection, query)
+
+            if self._query_cache is not None:
+                key = QueryCache.key(collection, query, sort, order, skip, limit)
+                version = self._query_cache.version(collection)
+                cached = self._query_cache.get(key)
+                if cached is not None:
+                    return cached
+
+            snapshot = list(db[collection])
+            snapshot_key = self._snapshot_key(collection)
+
+        if not query:
+            documents = [doc for doc in snapshot if not doc.get("_deleted")]
+        elif self._use_parallel(snapshot, query, parallel, workers):
+            documents = [snapshot[i] for i in self._parallel_match(collection, snapshot_key, snapshot, query, workers)]
+        else:
+            documents = [doc for doc in snapshot if not doc.get("_deleted") and self._match_document(doc, query)]
 
-            if not query:
-                documents = db[collection]
-            else:
-                documents = []
-                for doc in db[collection]:
-                    match = True
-                    for k, v in query.items():
-                        if k == '$or' and isinstance(v, list):
-                            match = any(
-                                all(self._evaluate_condition(doc.get(field), cond) for field, cond in subquery.items())
-                                for subquery in v
-                            )
-                        elif k == '$and' and isinstance(v, list):
-                            match = all(
-                                all(self._evaluate_condition(doc.get(field), cond) for field, cond in subquery.items())
-                                for subquery in v
-                            )
-                        else:
-                            match = self._evaluate_condition(doc.get(k), v)
+        if sort:
+            reverse = order.lower() == "desc"
+            documents.sort(key=lambda x: Utility._sort_key(x[sort]) if sort in x else Utility.SORT_LAST, reverse=reverse)
 
-                        if not match:
-                            break
+        documents = documents[skip:] if limit is None else documents[skip:skip + limit]
 
-                    if match:
-                        documents.append(doc)
+        if self._metrics is not None:
+            self._metrics.record_scan("find", len(snapshot), len(documents))
 
-            if sort:
-                reverse = order.lower() == "desc"
-                documents.sort(key=lambda x: x.get(sort) if sort in x else float('inf'), reverse=reverse)
+        results = [Utility.copy_document(doc) for doc in documents]
+        if self._query_cache is not None:
+            self._query_cache.put(key, results, version)
+        return results
+
+
+    def scan(self, collection: str, query: dict =None):
+        """Yield matching documents one at a time from a snapshot of the collection, without holding the lock."""
+        
+        with self.LOCK:
+            self._validate_collection_exists(collection)
+            query = self._decode_query(collection, query)
+            documents = list(self._read_db()[collection])
+        
+        for doc in documents:
+            if not doc.get("_deleted") and (not query or self._match_document(doc, query)):
+                yield Utility.copy_document(doc)
 
-            documents = documents[skip:] if limit is None else documents[skip:skip + limit]
 
-            return documents
+    def _parse_updates(self, updates: dict) -> dict:
+        """Normalize an update spec into {operator: {field: value}}. A plain dict is treated as $set."""
+        
+        if not any(key.startswith("$") for key in updates):
+            return {"$set": dict(updates)}
+        
+        operations = {}
+        for operator, fields in updates.items():
+            if operator not in self.UPDATE_OPERATORS:
+                raise UnsupportedOperatorError(operator)
+            if not isinstance(fields, dict):
+                raise DocumentValidationError(f"Operator '{operator}' expects a dict of fields.")
+            operations[operator] = dict(fields)
+        return operations
+
+
+    def _validate_update(self, collection: str, operations: dict) -> None:
+        """Validate the fields touched by an update against the collection's schema."""
+        
+        schema = self.get_schema(collection)
+        touched = set()
+        
+        for operator, fields in operations.items():
+            for field, value in fields.items():
+                if field in self.RESERVED_KEYS:
+                    raise ReservedKeyError(f"'{field}' {self.RESERVED_KEYS} are reserved keys.")
+                if field in touched:
+                    raise DocumentValidationError(f"Field '{field}' is targeted by more than one update operator.")
+                touched.add(field)
+                
+                field_type = schema.get(field)
+                
+                if operator == "$set":
+                    if field_type is datetime:
+                        if not isinstance(value, (str, datetime)):
+                            raise DocumentValidationError(f"Field '{field}' must be a datetime object or a string in ISO format.")
+                        if isinstance(value, str):
+                            try:
+                                value = datetime.fromisoformat(value)
+                            except ValueError:
+                                raise DocumentValidationError(f"Field '{field}' must be a valid ISO 8601 datetime string.")
+                        fields[field] = Utility.naive_utc(value)
+                    elif field_type is not None and not isinstance(value, field_type):
+                        raise DocumentValidationError(f"Field '{field}' must be of type {field_type.__name__}.")
+                        
+                elif operator == "$inc":
+                    if isinstance(value, bool) or not isinstance(value, (int, float)):
+                        raise DocumentValidationError(f"Cannot $inc field '{field}' by a non-numeric value.")
+                    if field_type is not None and field_type not in (int, float):
+                        raise DocumentValidationError(f"Cannot $inc field '{field}' of type {field_type.__name__}.")
+                    if field_type is int and isinstance(value, float):
+                        raise DocumentValidationError(f"Field '{field}' must be of type int.")
+                        
+                elif operator == "$push":
+                    if field_type is not None and field_type is not list:
+                        raise DocumentValidationError(f"Cannot $push to field '{field}' of type {field_type.__name__}.")
+                    if isinstance(value, dict) and "$each" in value and not isinstance(value["$each"], list):
+                        raise DocumentValidationError(f"'$each' for field '{field}' must be a list.")
+                        
+                elif operator == "$unset":
+                    if field_type is not None:
+                        raise DocumentValidationError(f"Cannot unset required field: {field}")
+
+
+    def _plan_update(self, doc: dict, operations: dict) -> tuple:
+        """Work out the fields update operators would set and remove on a document, without changing it."""
+        
+        changes = {}
+        removed = []
+        
+        for operator, fields in operations.items():
+            for field, value in fields.items():
+                if operator == "$set":
+                    if field not in doc or doc[field] != value:
+                        changes[field] = Utility.copy_value(value)
+                elif operator == "$inc":
+                    current = doc.get(field, 0)
+                    if isinstance(current, bool) or not isinstance(current, (int, float)):
+                        raise DocumentValidationError(f"Cannot $inc non-numeric field '{field}'.")
+                    if value != 0 or field not in doc:
+                        changes[field] = current + value
+                elif operator == "$push":
+                    current = doc.get(field, [])
+                    if not isinstance(current, list):
+                        raise DocumentValidationError(f"Cannot $push to non-list field '{field}'.")
+                    items = value["$each"] if isinstance(value, dict) and "$each" in value else [value]
+                    if items or field not in doc:
+                        changes[field] = current + Utility.copy_value(items)
+                elif operator == "$unset":
+                    if field in doc:
+                        removed.append(field)
+        
+        return changes, removed
 
 
-    def update(self, collection: str, updates: dict, query: dict =None, limit: int =0) -> list:
-        """Update all documents in a collection that match the query."""
+    def _apply_update(self, doc: dict, plan: tuple) -> dict:
+        """Return an updated copy of a document, or None if the planned update changes nothing.
+        
+        Stored documents are replaced rather than changed in place, so snapshots taken by find and scan stay consistent."""
+        
+        changes, removed = plan
+        if not (changes or removed):
+            return None
+        doc = doc.copy()
+        doc.update(changes)
+        for field in removed:
+            del doc[field]
+        return doc
+
+
+    def update(self, collection: str, updates: dict, query: dict =None, limit: int =0, return_docs: bool =True, parallel: bool =False, workers: int =None):
+        """Update documents in a collection that match the query using $set, $inc, $push and $unset operators."""
         
         with self.LOCK:
             self._validate_collection_exists(collection)
             
-            updated_count = 0
+            operations = self._parse_updates(updates)
+            self._validate_update(collection, operations)
+            
+            scanned_count = 0
+            matched_count = 0
+            modified_count = 0
             updated_documents = []
+            changed_documents = []
             
             if self.get_count(collection) <= 0:
-                return updated_documents
+                return updated_documents if return_docs else {"matched": 0, "modified": 0}
             
             if query is None:
                 query = {}
+            query = self._decode_query(collection, query)
                 
             db = self._read_db()
             collection_data = db[collection]
+            prematched = self._use_parallel(collection_data, query, parallel, workers)
+            if prematched:
+                positions = self._parallel_match(collection, self._snapshot_key(collection), collection_data, query, workers)
+                scanned_count = len(collection_data)
+            else:
+                positions = range(len(collection_data))
 
-            for doc in collection_data:
-                if updated_count >= limit and limit > 0:
+            # Plan every matched document first so an operator failing on one document leaves all of them unchanged
+            plans = []
+            for i in positions:
+                if limit > 0 and matched_count >= limit:
                     break
 
-                match = True
-                for k, v in query.items():
-                    if k == '$or' and isinstance(v, list):
-                        match = any(
-                            all(self._evaluate_condition(doc.get(field), cond) for field, cond in subquery.items())
-                            for subquery in v
-                        )
-                    elif k == '$and' and isinstance(v, list):
-                        match = all(
-                            all(self._evaluate_condition(doc.get(field), cond) for field, cond in subquery.items())
-                            for subquery in v
-                        )
-                    else:
-                        match = self._evaluate_condition(doc.get(k), v)
+                doc = collection_data[i]
+                if not prematched:
+                    scanned_count += 1
+                    if doc.get("_deleted") or not self._match_document(doc, query):
+                        continue
 
-                    if not match:
-                        break
+                matched_count += 1
+                plans.append((i, self._plan_update(doc, operations)))
 
-                if match:
-                    updated_doc = {**doc, **updates}
-                    try:
-                        self._validate_document(collection, updated_doc)
-                    except DocumentValidationError as e:
-                        raise e
-                    doc.update(updates)
-                    updated_count += 1
-                    updated_documents.append(doc)
+            for i, plan in plans:
+                doc = self._apply_update(collection_data[i], plan)
+                if doc is not None:
+                    collection_data[i] = doc
+                    modified_count += 1
+                    if self._changes is not None:
+                        changed_documents.append(doc)
+                if return_docs:
+                    updated_documents.append(Utility.copy_document(collection_data[i]))
 
-            self._write_db(db)
-            return updated_documents
+            if modified_count:
+                self._write_db(db)
+                self._changed(collection, "update", changed_documents)
+            if self._metrics is not None:
+                self._metrics.record_scan("update", scanned_count, matched_count)
+
+            if return_docs:
+                return updated_documents
+            return {"matched": matched_count, "modified": modified_count}
 
 
-    def delete(self, collection: str, query: dict = None, limit: int = 0) -> list:
-        """Delete documents from a collection that match the query. If no query is provided, delete the first N documents (or all if limit=0)."""
+    def delete(self, collection: str, query: dict = None, limit: int = 0, parallel: bool = False, workers: int = None) -> list:
+        """Delete documents from a collection that match the query. If no query is provided, delete the first N documents (or all if limit=0).
+        
+        Deleted documents are replaced in place by tombstones that scans skip, and are physically
+        removed once the dead fraction of the collection crosses COMPACT_THRESHOLD."""
 
         with self.LOCK:
             self._validate_collection_exists(collection)
@@ -381,57 +967,168 @@ class Database:
                 return []
 
             deleted_docs = []
+            scanned_count = 0
             db = self._read_db()
             collection_data = db[collection]
+            dead = db["_meta"].setdefault("_dead", {})
 
-            if query is None:
-                if limit == 0:
-                    deleted_docs = collection_data[:]
-                    db[collection] = []
-                else:
-                    deleted_docs = collection_data[:limit]  # ✅ Delete first N
-                    db[collection] = collection_data[limit:]
+            if query is None and limit == 0:
+                deleted_docs = [Utility.copy_document(doc) for doc in collection_data if not doc.get("_deleted")]
+                scanned_count = len(collection_data)
+                db[collection] = []
+                dead[collection] = 0
             else:
-                new_data = []
-                matched_count = 0
+                query = self._decode_query(collection, query or {})
 
-                for doc in collection_data:
-                    if limit > 0 and matched_count >= limit:
-                        new_data.append(doc)
-                        continue
+                prematched = self._use_parallel(collection_data, query, parallel, workers)
+                if prematched:
+                    positions = self._parallel_match(collection, self._snapshot_key(collection), collection_data, query, workers)
+                    scanned_count = len(collection_data)
+                else:
+                    positions = range(len(collection_data))
 
-                    match = True
-                    for k, v in query.items():
-                        if k == '$or' and isinstance(v, list):
-                            match = any(
-                                all(self._evaluate_condition(doc.get(field), cond) for field, cond in subquery.items())
-                                for subquery in v
-                            )
-                        elif k == '$and' and isinstance(v, list):
-                            match = all(
-                                all(self._evaluate_condition(doc.get(field), cond) for field, cond in subquery.items())
-                                for subquery in v
-                            )
-                        else:
-                            match = self._evaluate_condition(doc.get(k), v)
-
-                        if not match:
-                            break
-
-                    if match:
-                        deleted_docs.append(doc)
-                        matched_count += 1
-                    else:
-                        new_data.append(doc)
+                for i in positions:
+                    if limit > 0 and len(deleted_docs) >= limit:
+                        break
+
+                    doc = collection_data[i]
+                    if not prematched:
+                        scanned_count += 1
+                        if doc.get("_deleted") or not self._match_document(doc, query):
+                            continue
 
-                db[collection] = new_data
+                    deleted_docs.append(Utility.copy_document(doc))
+                    collection_data[i] = {"_id": doc.get("_id"), "_deleted": True}
 
+                dead[collection] = dead.get(collection, 0) + len(deleted_docs)
+
+                if collection_data and dead[collection] / len(collection_data) > self.COMPACT_THRESHOLD:
+                    self._compact_collection(db, collection)
+
+            db["_meta"]["_count"][collection] = len(db[collection]) - dead[collection]
             self._write_db(db)
-            self._set_count(collection)
+            self._changed(collection, "delete", deleted_docs)
+
+            if self._metrics is not None:
+                self._metrics.record_scan("delete", scanned_count, len(deleted_docs))
 
             return deleted_docs
 
 
+    def _compact_collection(self, db: dict, collection: str) -> int:
+        """Physically remove tombstones from a collection. Returns the number removed."""
+        
+        dead = db["_meta"].setdefault("_dead", {})
+        if not dead.get(collection):
+            return 0
+        
+        live = [doc for doc in db[collection] if not doc.get("_deleted")]
+        removed = len(db[collection]) - len(live)
+        db[collection] = live
+        dead[collection] = 0
+        return removed
+
+
+    def compact(self, collection: str = None) -> int:
+        """Remove deleted documents from one collection, or from all collections if none is given."""
+        
+        with self.LOCK:
+            if collection is not None:
+                self._validate_collection_exists(collection)
+            
+            db = self._read_db()
+            collections = [collection] if collection is not None else [name for name in db if name != "_meta"]
+            
+            removed = 0
+            for name in collections:
+                count = self._compact_collection(db, name)
+                if count:
+                    self._changed(name)
+                removed += count
+            
+            if removed:
+                self._write_db(db)
+            return removed
+
+
+    def metrics(self, reset: bool = False) -> dict:
+        """Return per-operation timings, file I/O, lock wait and scan counters. Empty if instrumentation is disabled."""
+        
+        if self._metrics is None:
+            return {}
+        
+        snapshot = self._metrics.snapshot()
+        if reset:
+            self._metrics.reset()
+        return snapshot
+
+
+    def _change_filter(self, collection: str, query: dict):
+        """Build a predicate selecting change events for a collection (or all collections) and query."""
+        
+        if self._changes is None:
+            raise RuntimeError("The change feed is disabled (change_buffer=0).")
+        if collection is not None:
+            self._validate_collection_exists(collection)
+            query = self._decode_query(collection, query)
+        
+        def match(event):
+            if collection is not None and event["collection"] != collection:
+                return False
+            return not query or self._match_document(event["document"], query)
+        
+        return match
+
+
+    def watch(self, collection: str =None, query: dict =None, since: int =None, timeout: float =None):
+        """Yield insert/update/delete events as they happen, optionally resuming after a sequence number."""
+        
+        match = self._change_filter(collection, query)
+        if since is None:
+            since = self._changes.seq
+        return self._changes.watch(since, match, timeout)
+
+
+    def changes(self, collection: str =None, query: dict =None, since: int =0) -> dict:
+        """Return buffered change events after a sequence number without waiting, and the latest sequence number.
+        
+        Pass since=None to only get the current sequence number to resume from."""
+        
+        match = self._change_filter(collection, query)
+        seq = self._changes.seq
+        if since is None:
+            return {"seq": seq, "events": []}
+        return {"seq": seq, "events": [event for event in self._changes.changes(since, match) if event["seq"] <= seq]}
+
+
+    def cache_stats(self) -> dict:
+        """Return query cache hit/miss/eviction counters and memory use. Empty if the cache is disabled."""
+        
+        if self._query_cache is None:
+            return {}
+        return self._query_cache.stats()
+
+
+    def stats(self, collection: str = None) -> dict:
+        """Return live and deleted (not yet compacted) document counts per collection."""
+        
+        with self.LOCK:
+            if collection is not None:
+                self._validate_collection_exists(collection)
+            
+            db = self._read_db()
+            collections = [collection] if collection is not None else [name for name in db if name != "_meta"]
+            dead = db["_meta"].get("_dead", {})
+            
+            return {
+                name: {
+                    "count": len(db[name]) - dead.get(name, 0),
+                    "deleted": dead.get(name, 0),
+                }
+                for name in collections
+            }
+
+
     def backup_db(self, backup_file: str ="backup") -> str:
         """Create a backup of the database."""
         
@@ -440,6 +1137,8 @@ class Database:
             if not os.path.exists(self.DB_FILE):
                 raise FileNotFoundError(f"Database file '{self.DB_FILE}' does not exist.")
 
+            self._flush()
+
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_filename = f"{backup_file}_{timestamp}.json"
 
@@ -481,6 +1180,8 @@ class Database:
                 if collection_name == "_meta":
                     continue
 
+                docs = [doc for doc in docs if not doc.get("_deleted")]
+
                 backup_schema = backup_schemas.get(collection_name, {})
 
                 if collection_name not in db:
@@ -516,3 +1217,27 @@ class Database:
             print("Restore completed successfully.")
             return True
         return False
+
+
+_WORKER_SNAPSHOTS = {}
+
+
+def _match_range(collection: str, name: str, size: int, query: dict, offset: int, count: int) -> list:
+    """Process pool worker: return matching positions in a range of a collection snapshot held in shared memory.
+    
+    The unpickled snapshot is kept per collection, so each worker decodes a collection version only once."""
+    
+    cached = _WORKER_SNAPSHOTS.get(collection)
+    if cached is None or cached[0] != name:
+        from multiprocessing import shared_memory
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            with shm.buf[:size] as view:
+                cached = (name, pickle.loads(view))
+        finally:
+            shm.close()
+        _WORKER_SNAPSHOTS[collection] = cached
+    
+    documents = cached[1]
+    return [i for i in range(offset, min(offset + count, len(documents)))
+            if not documents[i].get("_deleted") and Database._match_document(documents[i], query)]
@@ -41,3 +41,16 @@ class UnsupportedOperatorError(Exception):
         self.operator = operator
         self.message = f"{operator} {message}"
         super().__init__(self.message)
+
+    def __reduce__(self):
+        return (type(self), (self.operator,))
+
+
+class ChangeFeedError(Exception):
+    """Raised when a change feed cannot resume because the requested events are no longer buffered."""
+    
+    def __init__(self, seq, oldest, message="Change events are no longer available after sequence"):
+        self.seq = seq
+        self.oldest = oldest
+        self.message = f"{message} {seq} (oldest buffered: {oldest})"
+        super().__init__(self.message)
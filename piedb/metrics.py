@@ -0,0 +1,165 @@
+import time
+import functools
+from threading import Lock
+from threading import local
+
+
+class Metrics:
+    """Per-operation counters, latency histograms and I/O counters for a Database."""
+
+    BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+    def __init__(self, hook=None) -> None:
+        self.hook = hook
+        self._lock = Lock()
+        self._local = local()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all collected metrics."""
+
+        with self._lock:
+            self.operations = {}
+            self.scans = {}
+            self.io = {"reads": 0, "read_bytes": 0, "read_seconds": 0.0, "cache_hits": 0, "writes": 0, "write_bytes": 0, "write_seconds": 0.0}
+            self.lock_wait = {"acquires": 0, "seconds": 0.0, "max_seconds": 0.0}
+
+    def _emit(self, kind: str, name: str, data: dict) -> None:
+        """Forward a measurement to the export hook, never letting it break the database call."""
+
+        if self.hook is None:
+            return
+        try:
+            self.hook(kind, name, data)
+        except Exception:
+            pass
+
+    def wrap(self, name: str, func):
+        """Wrap a public method so that only the outermost call on each thread is timed."""
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            depth = getattr(self._local, "depth", 0)
+            self._local.depth = depth + 1
+            start = time.perf_counter()
+            error = False
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                error = True
+                raise
+            finally:
+                self._local.depth = depth
+                if depth == 0:
+                    self.record_operation(name, time.perf_counter() - start, error)
+
+        return wrapper
+
+    def record_operation(self, name: str, seconds: float, error: bool =False) -> None:
+        with self._lock:
+            op = self.operations.get(name)
+            if op is None:
+                op = {"count": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0, "buckets": [0] * (len(self.BUCKETS) + 1)}
+                self.operations[name] = op
+            op["count"] += 1
+            op["errors"] += int(error)
+            op["total_seconds"] += seconds
+            op["max_seconds"] = max(op["max_seconds"], seconds)
+            for i, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    op["buckets"][i] += 1
+                    break
+            else:
+                op["buckets"][-1] += 1
+        self._emit("operation", name, {"seconds": seconds, "error": error})
+
+    def record_io(self, kind: str, nbytes: int, seconds: float) -> None:
+        """Record a file read or write of the database file."""
+
+        with self._lock:
+            self.io[kind + "s"] += 1
+            self.io[kind + "_bytes"] += nbytes
+            self.io[kind + "_seconds"] += seconds
+        self._emit("io", kind, {"bytes": nbytes, "seconds": seconds})
+
+    def record_cache_hit(self) -> None:
+        """Record a read served from the in-memory copy instead of the file."""
+
+        with self._lock:
+            self.io["cache_hits"] += 1
+
+    def record_lock_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.lock_wait["acquires"] += 1
+            self.lock_wait["seconds"] += seconds
+            self.lock_wait["max_seconds"] = max(self.lock_wait["max_seconds"], seconds)
+        if seconds > 0.001:
+            self._emit("lock_wait", "LOCK", {"seconds": seconds})
+
+    def record_scan(self, name: str, scanned: int, returned: int) -> None:
+        """Record how many documents an operation visited and how many it matched."""
+
+        with self._lock:
+            scan = self.scans.setdefault(name, {"scanned": 0, "returned": 0})
+            scan["scanned"] += scanned
+            scan["returned"] += returned
+        self._emit("scan", name, {"scanned": scanned, "returned": returned})
+
+    def _percentile(self, buckets: list, count: int, pct: float) -> float:
+        """Upper bound of the histogram bucket containing the given percentile."""
+
+        target = count * pct
+        seen = 0
+        for i, n in enumerate(buckets):
+            seen += n
+            if seen >= target:
+                return self.BUCKETS[i] if i < len(self.BUCKETS) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        """Return a copy of all metrics with derived averages and percentiles."""
+
+        with self._lock:
+            operations = {}
+            for name, op in self.operations.items():
+                operations[name] = {
+                    "count": op["count"],
+                    "errors": op["errors"],
+                    "total_seconds": op["total_seconds"],
+                    "avg_seconds": op["total_seconds"] / op["count"],
+                    "max_seconds": op["max_seconds"],
+                    "p50_seconds": self._percentile(op["buckets"], op["count"], 0.50),
+                    "p90_seconds": self._percentile(op["buckets"], op["count"], 0.90),
+                    "p99_seconds": self._percentile(op["buckets"], op["count"], 0.99),
+                    "histogram": dict(zip([str(b) for b in self.BUCKETS] + ["inf"], op["buckets"])),
+                }
+            return {
+                "operations": operations,
+                "io": dict(self.io),
+                "lock_wait": dict(self.lock_wait),
+                "scans": {name: dict(scan) for name, scan in self.scans.items()},
+            }
+
+
+class TimedLock:
+    """Lock wrapper that records how long callers wait to acquire it."""
+
+    def __init__(self, lock, metrics: Metrics) -> None:
+        self._lock = lock
+        self._metrics = metrics
+
+    def acquire(self, blocking: bool =True, timeout: float =-1) -> bool:
+        start = time.perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        self._metrics.record_lock_wait(time.perf_counter() - start)
+        return acquired
+
+    def release(self) -> None:
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
@@ -0,0 +1,117 @@
+import re
+import json
+import struct
+from datetime import datetime
+
+from .row import Row
+
+
+HEADER = struct.Struct(">I")
+MAX_FRAME = 1 << 30
+TYPES = {"str": str, "int": int, "float": float, "bool": bool, "dict": dict, "list": list, "datetime": datetime}
+ESCAPED = re.compile(r"^\$+(date|type)$")
+
+
+class ProtocolEncoder(json.JSONEncoder):
+    """JSON encoder that tags datetimes and schema types so they survive the round trip."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.tags = 0
+
+    def default(self, obj):
+        if isinstance(obj, datetime):
+            self.tags += 1
+            return {"$date": obj.isoformat()}
+        if isinstance(obj, type) and obj in TYPES.values():
+            self.tags += 1
+            return {"$type": obj.__name__}
+        if isinstance(obj, Row):
+            return dict(obj)
+        return super().default(obj)
+
+
+def _escape(obj):
+    """Copy a value, prefixing one more '$' to the key of single-key dicts that would read as a tag."""
+
+    if isinstance(obj, (dict, Row)):
+        escaped = {key: _escape(value) for key, value in obj.items()}
+        if len(escaped) == 1:
+            key = next(iter(escaped))
+            if isinstance(key, str) and ESCAPED.match(key):
+                escaped = {"$" + key: escaped[key]}
+        return escaped
+    if isinstance(obj, (list, tuple)):
+        return [_escape(value) for value in obj]
+    return obj
+
+
+def _object_hook(obj: dict):
+    if len(obj) == 1:
+        key, value = next(iter(obj.items()))
+        if key == "$date":
+            try:
+                return datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid $date tag: {value!r}")
+        if key == "$type":
+            if value not in TYPES:
+                raise ValueError(f"Unknown $type tag: {value!r}")
+            return TYPES[value]
+        if ESCAPED.match(key):
+            return {key[1:]: value}
+    return obj
+
+
+def encode(message: dict) -> bytes:
+    """Serialize a message into a length-prefixed frame."""
+
+    encoder = ProtocolEncoder(separators=(",", ":"))
+    body = encoder.encode(message)
+    # A dict opening with a '$' key that the encoder did not tag itself comes from user data
+    # (a query operator or a document field); escape the message so it cannot be read as a tag.
+    if body.count('{"$') > encoder.tags:
+        body = ProtocolEncoder(separators=(",", ":")).encode(_escape(message))
+    body = body.encode("utf-8")
+    return HEADER.pack(len(body)) + body
+
+
+def decode(body: bytes) -> dict:
+    """Parse a frame body. Raises ValueError on malformed JSON or tags."""
+
+    try:
+        return json.loads(body.decode("utf-8"), object_hook=_object_hook)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Malformed frame: {e}")
+
+
+def _recv_exact(sock, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_body(sock) -> bytes:
+    """Read one raw frame body from a socket. Returns None when the peer closed the connection."""
+
+    header = _recv_exact(sock, HEADER.size)
+    if header is None:
+        return None
+    (size,) = HEADER.unpack(header)
+    if size > MAX_FRAME:
+        raise ValueError(f"Frame of {size} bytes exceeds the {MAX_FRAME} byte limit.")
+    return _recv_exact(sock, size)
+
+
+def recv_frame(sock) -> dict:
+    """Read and parse one frame from a socket. Returns None when the peer closed the connection."""
+
+    body = recv_body(sock)
+    if body is None:
+        return None
+    return decode(body)
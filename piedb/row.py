@@ -0,0 +1,120 @@
+from collections.abc import MutableMapping
+
+
+_MISSING = object()
+_LAYOUTS = {}
+
+
+class Row(MutableMapping):
+    """Compact, dict-like document for schema-bound collections.
+
+    Row.layout() generates one subclass per schema whose fields are stored in slots,
+    so a document costs one small object and no per-document key table. Keys outside
+    the schema go into an overflow dict."""
+
+    __slots__ = ("_extra",)
+    _fields = {}
+
+    def __init__(self, document: dict =()) -> None:
+        fields = self._fields
+        extra = None
+        for key, value in (document.items() if hasattr(document, "items") else document):
+            slot = fields.get(key)
+            if slot is not None:
+                setattr(self, slot, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        self._extra = extra
+
+    @staticmethod
+    def layout(names: tuple) -> type:
+        """Return the shared Row subclass with one slot per field name."""
+
+        cls = _LAYOUTS.get(names)
+        if cls is None:
+            slots = tuple("_%d" % i for i in range(len(names)))
+            cls = type("Row", (Row,), {"__slots__": slots, "_fields": dict(zip(names, slots)), "_names": names})
+            _LAYOUTS[names] = cls
+        return cls
+
+    def __getitem__(self, key):
+        slot = self._fields.get(key)
+        if slot is not None:
+            value = getattr(self, slot, _MISSING)
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        slot = self._fields.get(key)
+        if slot is not None:
+            return getattr(self, slot, default)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __contains__(self, key) -> bool:
+        slot = self._fields.get(key)
+        if slot is not None:
+            return hasattr(self, slot)
+        return self._extra is not None and key in self._extra
+
+    def __setitem__(self, key, value) -> None:
+        slot = self._fields.get(key)
+        if slot is not None:
+            setattr(self, slot, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key) -> None:
+        slot = self._fields.get(key)
+        if slot is not None:
+            if not hasattr(self, slot):
+                raise KeyError(key)
+            delattr(self, slot)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+            if not self._extra:
+                self._extra = None
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for name, slot in self._fields.items():
+            if hasattr(self, slot):
+                yield name
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        count = sum(1 for slot in self._fields.values() if hasattr(self, slot))
+        return count + (len(self._extra) if self._extra is not None else 0)
+
+    def items(self):
+        """Yield (key, value) pairs without a lookup per key."""
+
+        for name, slot in self._fields.items():
+            value = getattr(self, slot, _MISSING)
+            if value is not _MISSING:
+                yield name, value
+        if self._extra is not None:
+            yield from self._extra.items()
+
+    def copy(self) -> "Row":
+        return type(self)(self.items())
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def __reduce__(self):
+        return (_rebuild, (getattr(self, "_names", ()), dict(self.items())))
+
+
+def _rebuild(names: tuple, document: dict) -> Row:
+    return Row.layout(names)(document)
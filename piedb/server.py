@@ -0,0 +1,105 @@
+import os
+import sys
+import signal
+import socketserver
+
+from .db import Database
+from .protocol import decode
+from .protocol import encode
+from .protocol import recv_body
+
+
+# Methods that touch server-side paths or wipe the database; only served with allow_admin
+ADMIN_METHODS = {"drop_db", "backup_db", "restore_db"}
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    """Serve framed requests from one client connection, answering them in order."""
+
+    def handle(self) -> None:
+        server = self.server
+        while True:
+            try:
+                body = recv_body(self.request)
+            except (OSError, ValueError):
+                return
+            if body is None:
+                return
+
+            response = {"id": None}
+            try:
+                request = decode(body)
+                response["id"] = request.get("id")
+                method = request.get("method")
+                if method not in server.methods:
+                    raise AttributeError(f"'{method}' is not a supported method.")
+                result = getattr(server.db, method)(*request.get("args", []), **request.get("kwargs", {}))
+                response["ok"] = True
+                response["result"] = result
+            except Exception as e:
+                response["ok"] = False
+                response["error"] = type(e).__name__
+                response["message"] = getattr(e, "message", str(e))
+
+            try:
+                frame = encode(response)
+            except Exception as e:
+                frame = encode({"id": response["id"], "ok": False, "error": type(e).__name__, "message": str(e)})
+            try:
+                self.request.sendall(frame)
+            except OSError:
+                return
+
+
+class _ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _ThreadingTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def make_server(db: Database, socket_path: str =None, host: str ="127.0.0.1", port: int =None, allow_admin: bool =False):
+    """Create a server for an open Database on a Unix socket path or a TCP host/port.
+    
+    drop_db, backup_db and restore_db are refused unless allow_admin is set."""
+
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = _ThreadingUnixServer(socket_path, _Handler)
+    elif port is not None:
+        server = _ThreadingTCPServer((host, port), _Handler)
+    else:
+        raise ValueError("Either a socket path or a TCP port is required.")
+
+    server.db = db
+    server.methods = set(db.PUBLIC_METHODS) | {"metrics"}
+    if not allow_admin:
+        server.methods -= ADMIN_METHODS
+    return server
+
+
+def serve(db_file: str, socket_path: str =None, host: str ="127.0.0.1", port: int =None, flush_interval: float =None, allow_admin: bool =False) -> None:
+    """Hold a database in memory and serve it to many clients until interrupted."""
+
+    db = Database(db_file, flush_interval=flush_interval, instrument=True)
+    server = make_server(db, socket_path, host, port, allow_admin)
+    address = socket_path or f"{host}:{port}"
+    print(f"Serving '{db.DB_FILE}' on {address}", file=sys.stderr)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt()
+
+    signal.signal(signal.SIGTERM, stop)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        db.close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
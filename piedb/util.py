@@ -1,16 +1,21 @@
+import copy
 import time
 import json
 import random
 import string
 import hashlib
 from datetime import datetime
+from datetime import timezone
 
+from .row import Row
 from .error import SchemaValidationError
 
 
 class Utility:
     """Utility class for common operations in Piedb."""
     
+    SORT_LAST = (6,)
+    
     @staticmethod
     def generate_id(collection_name: str, length: int =12) -> str:
         """Generate an UniqueId."""
@@ -54,6 +59,51 @@ class Utility:
         type_map = {"str": str, "int": int, "float": float, "bool": bool, "dict": dict, "list": list, "datetime": datetime}
         return {k: type_map[v] for k, v in schema.items()}
     
+    @staticmethod
+    def copy_value(value: any) -> any:
+        """Deep-copy a JSON-like value. Immutable leaves (str, numbers, None, datetime) are shared."""
+        
+        value_type = type(value)
+        if value_type is dict:
+            return {key: Utility.copy_value(item) for key, item in value.items()}
+        if value_type is list:
+            return [Utility.copy_value(item) for item in value]
+        if value_type in (str, int, float, bool, datetime) or value is None:
+            return value
+        return copy.deepcopy(value)
+    
+    @staticmethod
+    def copy_document(doc: dict) -> dict:
+        """Copy a stored or incoming document into a plain dict that shares no mutable values with it."""
+        
+        return {key: Utility.copy_value(value) for key, value in doc.items()}
+    
+    @staticmethod
+    def naive_utc(value: datetime) -> datetime:
+        """Express a datetime as naive UTC, the form datetime fields are stored and compared in. Naive values are taken as UTC."""
+        
+        if value.tzinfo is None:
+            return value
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    @staticmethod
+    def _sort_key(value: any) -> tuple:
+        """Encode a value into a key that orders consistently across types (None < bool < number < str < datetime < other)."""
+        
+        if value is None:
+            return (0,)
+        if isinstance(value, bool):
+            return (1, value)
+        if isinstance(value, (int, float)):
+            return (2, value)
+        if isinstance(value, str):
+            return (3, value)
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            return (4, value.timestamp())
+        return (5, json.dumps(value, sort_keys=True, default=str))
+    
     @staticmethod
     def unique_collection_name(base_name: str, db: dict) -> str:
         """Find a unique collection name by appending an incrementing number."""
@@ -90,5 +140,7 @@ class CustomJSONEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, datetime): 
             return obj.isoformat()
+        if isinstance(obj, Row):
+            return dict(obj)
         return super().default(obj)
     
\ No newline at end of file